@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class FootballGraphConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'football_graph'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -4,31 +4,45 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from django.core.management.base import BaseCommand
-from football_graph.models import League, Club, Player, Data
+from football_graph.models import League, Club, Player, PlayerPosition, Data
+from football_graph.signals import bump_scatter_cache_version
+from football_graph.management.workers import setup_worker
+from django.db import connections, transaction
+import re
 import time
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from queue import Queue
+import multiprocessing
+from multiprocessing.util import Finalize
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from collections import deque
 import logging
+from logging.handlers import QueueHandler, QueueListener
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(threadName)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class Command(BaseCommand):
-    help = 'Scrape fotmob data using Selenium with multi-threading'
+    help = 'Scrape fotmob data using Selenium with multiprocessing'
 
     def add_arguments(self, parser):
         parser.add_argument(
             '--max-workers',
             type=int,
             default=3,
-            help='Maximum number of worker threads (default: 3)'
+            help='Maximum number of worker processes (default: 3)'
         )
 
     def handle(self, *args, **kwargs):
         max_workers = kwargs.get('max_workers', 3)
-        
+
+        log_queue, listener = start_logging()
+        try:
+            self.scrape(max_workers, log_queue)
+        finally:
+            listener.stop()
+
+    def scrape(self, max_workers, log_queue):
         urls = [
             'https://www.fotmob.com/leagues/53/overview/ligue-1',
             'https://www.fotmob.com/leagues/47/overview/premier-league',
@@ -36,26 +50,36 @@ class Command(BaseCommand):
             'https://www.fotmob.com/leagues/54/overview/bundesliga',
             'https://www.fotmob.com/leagues/55/overview/serie-a',
         ]
-        
-        driver = create_driver()
-        try:
-            all_team_links = get_squad_links(driver, urls)
-            logger.info(f"Found {len(all_team_links)} team links")
-        finally:
-            driver.quit()
 
-        if not all_team_links:
-            logger.error("No team links found, exiting")
-            return
+        run_pipeline(urls, log_queue, max_workers)
+
+# spawn : aucun fork d'un process qui a déjà des threads (listener de logs), et disponible sur tous les OS
+MP_CONTEXT = multiprocessing.get_context('spawn')
+
+def start_logging():
+    """Envoie les logs de tous les process dans une queue dépilée par un seul thread"""
+    # queue multiprocessing : les workers y écrivent aussi
+    log_queue = MP_CONTEXT.Queue(-1)
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(processName)s - %(message)s'))
+    listener = QueueListener(log_queue, handler)
 
-        all_player_links = get_player_links_multithreaded(all_team_links, max_workers)
-        logger.info(f"Found {len(all_player_links)} player links")
+    root = logging.getLogger()
+    root.handlers = [QueueHandler(log_queue)]
+    root.setLevel(logging.INFO)
+    listener.start()
+    return log_queue, listener
 
-        if not all_player_links:
-            logger.error("No player links found, exiting")
-            return
+# ressources inutiles au scraping : images, polices, feuilles de style, pub, trackers
+BLOCKED_URLS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg',
+    '*.woff', '*.woff2', '*.ttf',
+    '*.css',
+    '*google-analytics*', '*googletagmanager*', '*doubleclick*',
+    '*googlesyndication*', '*segment.io*', '*sentry*',
+]
 
-        get_player_data_multithreaded(all_player_links, max_workers)
+PAGE_LOAD_TIMEOUT = 15
 
 def create_driver():
     """Crée une instance de WebDriver avec les options appropriées"""
@@ -65,173 +89,228 @@ def create_driver():
     options.add_argument('--disable-dev-shm-usage')
     options.add_argument('--disable-gpu')
     options.add_argument('--window-size=1920,1080')
-    return webdriver.Chrome(service=Service(), options=options)
-
-def get_squad_links(driver, urls):
-    """Version originale pour récupérer les liens d'équipes"""
-    logger.info("Starting to scrape team links...")
+    options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    # driver.get rend la main dès le DOMContentLoaded
+    options.page_load_strategy = 'eager'
+    driver = webdriver.Chrome(service=Service(), options=options)
+    # seules les attentes explicites (WebDriverWait) sont utilisées
+    driver.implicitly_wait(0)
+    driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URLS})
+    return driver
+
+def load_page(driver, url):
+    """Charge une page sans attendre les ressources tierces trop lentes"""
     try:
-        all_team_links = []
-        for url in urls:
-            driver.get(url)
-            driver.implicitly_wait(5)
-
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "TableContainer"))
-            )
-            table_container = driver.find_element(By.CLASS_NAME, "TableContainer")
-            links = table_container.find_elements(By.TAG_NAME, "a")
-            league_title_element = driver.find_element(By.CLASS_NAME, "css-4ow769-TeamOrLeagueName")
-            league_title = get_text_or_none(league_title_element)
-
-            for link in links:
-                href = link.get_attribute("href")
-                if href and href.startswith("https://www.fotmob.com/teams/"):
-                    team_link = href.replace("overview", "squad")
-                    try:
-                        team_name = get_text_or_none(link.find_element(By.CLASS_NAME, "TeamName"))
-                    except:
-                        team_name = "Unknown Team"
-
-                    league, created = League.objects.get_or_create(name=league_title)
-                    club, created = Club.objects.get_or_create(
-                        name=team_name,
-                        league=league
-                    )
-
-                    all_team_links.append(team_link)
-
-        logger.info(f"Found {len(all_team_links)} team links.")
-        return all_team_links
-    except Exception as e:
-        logger.error(f"Error while scraping team links: {str(e)}")
-        return []
+        driver.get(url)
+    except TimeoutException:
+        # le contenu utile est souvent déjà là, les WebDriverWait tranchent
+        logger.warning(f"Page load timed out, continuing: {url}")
+
+# un driver par process worker, réutilisé entre les tâches
+_tls = threading.local()
+
+def init_worker():
+    """Initialise un process worker : connexions DB propres et driver dédié"""
+    # aucune connexion DB ne doit être partagée avec le process parent
+    connections.close_all()
+    driver = create_driver()
+    _tls.driver = driver
+    # atexit n'est pas appelé à la sortie des process multiprocessing
+    Finalize(driver, driver.quit, exitpriority=10)
+
+def get_driver():
+    """Renvoie le driver du process courant, créé à la demande"""
+    if getattr(_tls, 'driver', None) is None:
+        init_worker()
+    return _tls.driver
+
+def create_executor(max_workers, log_queue):
+    """Crée le pool de process workers, chacun avec son propre driver"""
+    # init_worker est importé par son chemin une fois Django configuré dans le worker
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=MP_CONTEXT,
+        initializer=setup_worker,
+        initargs=(log_queue, f'{__name__}.init_worker'),
+    )
+
+# titre de la ligue et (lien, nom) de chaque équipe du classement
+JS_EXTRACT_LEAGUE = """
+const title = document.querySelector('.css-4ow769-TeamOrLeagueName');
+const table = document.querySelector('.TableContainer');
+return {
+    title: title ? title.innerText.trim() : null,
+    teams: Array.from(table.querySelectorAll('a'), link => {
+        const name = link.querySelector('.TeamName');
+        return [link.href, name ? name.innerText.trim() : null];
+    }),
+};
+"""
+
+JS_SQUAD_LINKS = "return Array.from(document.querySelectorAll('.css-9pqpod-SquadPlayerLink'), link => link.href);"
+
+def scrape_league(url):
+    """Scrape le classement d'une ligue (fonction pour worker)"""
+    driver = get_driver()
+    logger.debug(f"Scraping league: {url}")
+    load_page(driver, url)
+
+    WebDriverWait(driver, 10).until(
+        EC.presence_of_element_located((By.CLASS_NAME, "TableContainer"))
+    )
+    page = driver.execute_script(JS_EXTRACT_LEAGUE)
+
+    teams = [
+        (href.replace("overview", "squad"), team_name or "Unknown Team")
+        for href, team_name in page['teams']
+        if href and href.startswith("https://www.fotmob.com/teams/")
+    ]
+    return page['title'], teams
+
+def save_league(league_title, team_names):
+    """Enregistre une ligue et ses clubs, renvoie {nom du club: id}"""
+    league, created = League.objects.get_or_create(name=league_title)
+
+    # la contrainte (name, league) ignore les clubs déjà en base
+    Club.objects.bulk_create(
+        [Club(name=team_name, league=league) for team_name in team_names],
+        ignore_conflicts=True,
+    )
+    return dict(league.clubs.values_list('name', 'id'))
 
 def scrape_team_players(team_link):
-    """Scrape les joueurs d'une équipe (fonction pour thread)"""
-    driver = create_driver()
+    """Scrape les joueurs d'une équipe (fonction pour worker)"""
+    driver = get_driver()
     try:
-        logger.info(f"Scraping team: {team_link}")
-        driver.get(team_link)
-        driver.implicitly_wait(5)
+        logger.debug(f"Scraping team: {team_link}")
+        load_page(driver, team_link)
 
         WebDriverWait(driver, 10).until(
             EC.presence_of_element_located((By.CLASS_NAME, "css-9pqpod-SquadPlayerLink"))
         )
-        player_links = driver.find_elements(By.CLASS_NAME, "css-9pqpod-SquadPlayerLink")
+        player_links = driver.execute_script(JS_SQUAD_LINKS)
         
-        team_player_links = []
-        for player_link in player_links:
-            href = player_link.get_attribute("href")
-            if href and href.startswith("https://www.fotmob.com/players/"):
-                team_player_links.append(href)
+        team_player_links = [
+            href for href in player_links
+            if href and href.startswith("https://www.fotmob.com/players/")
+        ]
         
-        logger.info(f"Found {len(team_player_links)} players for team")
+        logger.debug(f"Found {len(team_player_links)} players for team")
         return team_player_links
 
     except Exception as e:
         logger.error(f"Error scraping team {team_link}: {e}")
         return []
-    finally:
-        driver.quit()
-
-def get_player_links_multithreaded(team_links, max_workers=3):
-    """Version multi-thread pour récupérer les liens de joueurs"""
-    logger.info(f"Starting to scrape player links with {max_workers} workers...")
-    all_player_links = []
-    
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_team = {executor.submit(scrape_team_players, team_link): team_link 
-                         for team_link in team_links}
-        
-        for future in as_completed(future_to_team):
-            team_link = future_to_team[future]
-            try:
-                player_links = future.result()
-                all_player_links.extend(player_links)
-            except Exception as e:
-                logger.error(f"Error processing team {team_link}: {e}")
-    
-    return all_player_links
 
-def scrape_single_player(player_link, index, total):
-    """Scrape un seul joueur (fonction pour thread)"""
-    driver = create_driver()
-    try:
-        return scrape_player_with_driver(driver, player_link, index, total)
-    finally:
-        driver.quit()
-
-def scrape_player_with_driver(driver, player_link, index, total):
+# libellé fotmob -> champ de Data
+LABEL_TO_KEY = {
+    'Goals': 'goals',
+    'Expected goals (xG)': 'expected_goals',
+    'xG on target (xGOT)': 'xg_on_target',
+    'Penalty goals': 'penalty_goals',
+    'Non-penalty xG': 'non_penalty_xg',
+    'Shots': 'shots',
+    'Shots on target': 'shots_on_target',
+    'Assists': 'assists',
+    'Expected assists (xA)': 'expected_assists',
+    'Successful passes': 'successful_passes',
+    'Pass accuracy': 'pass_accuracy',
+    'Accurate long balls': 'accurate_long_balls',
+    'Long ball accuracy': 'long_ball_accuracy',
+    'Chances created': 'chances_created',
+    'Successful crosses': 'successful_crosses',
+    'Cross accuracy': 'cross_accuracy',
+    'Successful dribbles': 'successful_dribbles',
+    'Dribble success': 'dribble_success',
+    'Touches': 'touches',
+    'Touches in opposition box': 'touches_in_opposition_box',
+    'Dispossessed': 'dispossessed',
+    'Fouls won': 'fouls_won',
+    'Penalties awarded': 'penalties_awarded',
+    'Tackles won': 'tackles_won',
+    'Tackles won %': 'tackles_won_percentage',
+    'Duels won': 'duels_won',
+    'Duels won %': 'duels_won_percentage',
+    'Aerial duels won': 'aerial_duels_won',
+    'Aerial duels won %': 'aerial_duels_won_percentage',
+    'Interceptions': 'interceptions',
+    'Blocked': 'blocked',
+    'Fouls committed': 'fouls_committed',
+    'Recoveries': 'recoveries',
+    'Possession won final 3rd': 'possession_won_final_3rd',
+    'Dribbled past': 'dribbled_past',
+    'Yellow cards': 'yellow_cards',
+    'Red cards': 'red_cards',
+    'Saves': 'saves',
+    'Save percentage': 'save_percentage',
+    'Goals conceded': 'goals_conceded',
+    'Goals prevented': 'goals_prevented',
+    'Clean sheets': 'clean_sheets',
+    'Error led to goal': 'error_led_to_goal',
+    'High claim': 'high_claim',
+}
+
+# les gardiens partagent certains libellés avec les joueurs de champ
+GK_LABEL_TO_KEY = {
+    **LABEL_TO_KEY,
+    'Pass accuracy': 'gk_pass_accuracy',
+    'Accurate long balls': 'gk_accurate_long_balls',
+    'Long ball accuracy': 'gk_long_ball_accuracy',
+}
+
+# extrait nom, club, postes, bio et stats d'une page joueur en un seul appel
+JS_EXTRACT_PLAYER = """
+const text = (root, selector) => {
+    const element = root.querySelector(selector);
+    return element ? element.innerText.trim() : null;
+};
+const pairs = (selector, titleSelector, valueSelector) => Array.from(
+    document.querySelectorAll(selector),
+    item => [text(item, titleSelector), text(item, valueSelector)]
+);
+return {
+    name: text(document, '.css-zt63wq-PlayerNameCSS'),
+    club: text(document, '.css-14k6s2u-TeamCSS'),
+    positions: Array.from(document.querySelectorAll('.css-1g41csj-PositionsCSS'), item => item.innerText.trim()),
+    bio: pairs('[class*="PlayerBioStatCSS"]', '.css-10h4hmz-StatTitleCSS', '.css-to3w1c-StatValueCSS'),
+    stats: pairs('.css-1v73fp6-StatItemCSS', '.css-2duihq-StatTitle', '.css-jb6lgd-StatValue'),
+};
+"""
+
+def scrape_single_player(player_link, index):
+    """Scrape un seul joueur (fonction pour worker)"""
+    return scrape_player_with_driver(get_driver(), player_link, index)
+
+def scrape_player_with_driver(driver, player_link, index):
     """Version modifiée de get_player_data pour un seul joueur"""
-    data_match_dict = {
-        'goals': 'Goals',
-        'expected_goals': 'Expected goals (xG)',
-        'xg_on_target': 'xG on target (xGOT)',
-        'penalty_goals': 'Penalty goals',
-        'non_penalty_xg': 'Non-penalty xG',
-        'shots': 'Shots',
-        'shots_on_target': 'Shots on target',
-        'assists': 'Assists',
-        'expected_assists': 'Expected assists (xA)',
-        'successful_passes': 'Successful passes',
-        'pass_accuracy': 'Pass accuracy',
-        'accurate_long_balls': 'Accurate long balls',
-        'long_ball_accuracy': 'Long ball accuracy',
-        'chances_created': 'Chances created',
-        'successful_crosses': 'Successful crosses',
-        'cross_accuracy': 'Cross accuracy',
-        'successful_dribbles': 'Successful dribbles',
-        'dribble_success': 'Dribble success',
-        'touches': 'Touches',
-        'touches_in_opposition_box': 'Touches in opposition box',
-        'dispossessed': 'Dispossessed',
-        'fouls_won': 'Fouls won',
-        'penalties_awarded': 'Penalties awarded',
-        'tackles_won': 'Tackles won',
-        'tackles_won_percentage': 'Tackles won %',
-        'duels_won': 'Duels won',
-        'duels_won_percentage': 'Duels won %',
-        'aerial_duels_won': 'Aerial duels won',
-        'aerial_duels_won_percentage': 'Aerial duels won %',
-        'interceptions': 'Interceptions',
-        'blocked': 'Blocked',
-        'fouls_committed': 'Fouls committed',
-        'recoveries': 'Recoveries',
-        'possession_won_final_3rd': 'Possession won final 3rd',
-        'dribbled_past': 'Dribbled past',
-        'yellow_cards': 'Yellow cards',
-        'red_cards': 'Red cards',
-        'saves': 'Saves',
-        'save_percentage': 'Save percentage',
-        'goals_conceded': 'Goals conceded',
-        'goals_prevented': 'Goals prevented',
-        'clean_sheets': 'Clean sheets',
-        'error_led_to_goal': 'Error led to goal',
-        'high_claim': 'High claim',
-        'gk_pass_accuracy': 'Pass accuracy',
-        'gk_accurate_long_balls': 'Accurate long balls',
-        'gk_long_ball_accuracy': 'Long ball accuracy',
-    }
-
-    player_slug = player_link.rsplit('/', 1)[-1]
-    logger.info(f"Processing player {index}/{total}: {player_slug}")
+    parts = player_link.rstrip('/').split('/')
+    player_slug = parts[-1]
+    logger.debug(f"Processing player {index}: {player_slug}")
     
     try:
-        driver.get(player_link)
+        load_page(driver, player_link)
         WebDriverWait(driver, 10).until(
             EC.presence_of_element_located((By.CLASS_NAME, "css-zt63wq-PlayerNameCSS"))
         )
+        try:
+            WebDriverWait(driver, 5).until(
+                EC.presence_of_element_located((By.CLASS_NAME, "css-1v73fp6-StatItemCSS"))
+            )
+        except TimeoutException:
+            pass
 
-        name = get_text_or_none(driver.find_element(By.CLASS_NAME, "css-zt63wq-PlayerNameCSS"))
-        club_name = get_text_or_none(driver.find_element(By.CLASS_NAME, "css-14k6s2u-TeamCSS"))
-        if club_name.endswith('(on loan)'):
+        # un seul aller-retour avec chromedriver pour toute la page
+        page = driver.execute_script(JS_EXTRACT_PLAYER)
+
+        name = page['name']
+        club_name = page['club']
+        if club_name and club_name.endswith('(on loan)'):
             club_name = club_name[:-len(' (on loan)')].strip()
         
-        positions = driver.find_elements(By.CLASS_NAME, "css-1g41csj-PositionsCSS")
-        positions_text = ', '.join([get_text_or_none(pos) for pos in positions])
+        positions_text = ', '.join(position for position in page['positions'] if position)
 
-        stat_fields = driver.find_elements(By.XPATH, "//*[contains(@class, 'PlayerBioStatCSS')]")
         player_data = {
             'height': None,
             'shirt_number': None,
@@ -241,15 +320,12 @@ def scrape_player_with_driver(driver, player_link, index, total):
             'market_value': None,
         }
         
-        for field in stat_fields:
+        for title, value in page['bio']:
             try:
-                title = get_text_or_none(field.find_element(By.CLASS_NAME, "css-10h4hmz-StatTitleCSS"))
-                value = get_text_or_none(field.find_element(By.CLASS_NAME, "css-to3w1c-StatValueCSS"))
-
                 if title == "Height":
                     player_data['height'] = int(value.split()[0]) if value.split()[0].isdigit() else None
                 elif title == "Shirt":
-                    player_data['shirt_number'] = value
+                    player_data['shirt_number'] = int(value) if value.isdigit() else None
                 elif title == "Preferred foot":
                     player_data['foot'] = value
                 elif title == "Country":
@@ -261,107 +337,203 @@ def scrape_player_with_driver(driver, player_link, index, total):
             except Exception as e:
                 logger.warning(f"Error parsing stat field: {e}")
 
-        fotmob_id = player_link.split('/')[-2]
+        fotmob_id = int(parts[-2])
+
+        player_fields = {
+            'fotmob_id': fotmob_id,
+            # name et country sont NOT NULL : une valeur absente ne doit pas faire échouer tout le lot
+            'name': name or '',
+            # résolu en club_id par le process parent au moment de l'écriture
+            'club_name': club_name,
+            'position': positions_text,
+            'country': player_data.get('country') or '',
+            'shirt_number': player_data.get('shirt_number'),
+            'age': player_data.get('age'),
+            'height': player_data.get('height'),
+            'market_value': player_data.get('market_value'),
+        }
 
-        # lock pour les opérations de base de données
-        with db_lock:
-            try:
-                club = Club.objects.get(name=club_name)
-            except Club.DoesNotExist:
-                logger.info(f"{club_name} not found.")
-
-            player, _ = Player.objects.update_or_create(
-                fotmob_id=fotmob_id,
-                defaults={
-                    'name': name,
-                    'club': club,
-                    'position': positions_text,
-                    'country': player_data.get('country'),
-                    'shirt_number': int(player_data['shirt_number']) if player_data.get('shirt_number') and player_data['shirt_number'].isdigit() else None,
-                    'age': player_data.get('age'),
-                    'height': player_data.get('height'),
-                    'market_value': player_data.get('market_value'),
-                }
-            )
+        if not page['stats']:
+            logger.debug(f"\033[93mNo stats available for {name}.\033[0m")
+            return player_fields, None
 
-        try:
-            WebDriverWait(driver, 5).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "css-1v73fp6-StatItemCSS"))
-            )
-            stat_items = driver.find_elements(By.CLASS_NAME, "css-1v73fp6-StatItemCSS")
-            stats_data = {}
-            for item in stat_items:
-                title = get_text_or_none(item.find_element(By.CLASS_NAME, "css-2duihq-StatTitle"))
-                value = get_text_or_none(item.find_element(By.CLASS_NAME, "css-jb6lgd-StatValue"))
-                for key, label in data_match_dict.items():
-                    if title == label:
-                        stats_data[key] = parse_stat_value(value)
-            
-            with db_lock:
-                Data.objects.update_or_create(player=player, defaults=stats_data)
-            
-            logger.info(f"\033[92m{name} scraped and updated.\033[0m")
-            return True
-        except:
-            logger.info(f"\033[93mNo stats available for {name}.\033[0m")
-            return True
+        label_to_key = GK_LABEL_TO_KEY if 'keeper' in positions_text.lower() else LABEL_TO_KEY
+        stats_data = {
+            label_to_key[title]: parse_stat_value(value)
+            for title, value in page['stats']
+            if title in label_to_key
+        }
+
+        logger.debug(f"\033[92m{name} scraped.\033[0m")
+        return player_fields, stats_data
 
     except Exception as e:
         logger.error(f"\033[91mError for player {player_slug}: {e}\033[0m")
-        return False
+        return None
+
+BATCH_SIZE = 100
+PLAYER_UPDATE_FIELDS = [
+    'name', 'club', 'position', 'country', 'shirt_number', 'age', 'height', 'market_value',
+]
+
+def save_player_batch(batch, club_map):
+    """Enregistre un lot de joueurs et leurs stats en quelques requêtes"""
+    if not batch:
+        return
+
+    # un même joueur peut apparaître dans deux effectifs : on garde le dernier
+    batch = list({player_fields['fotmob_id']: (player_fields, stats_data) for player_fields, stats_data in batch}.values())
+
+    # nouveaux dicts : le lot de l'appelant reste intact
+    rows = []
+    for player_fields, stats_data in batch:
+        club_name = player_fields['club_name']
+        fields = {key: value for key, value in player_fields.items() if key != 'club_name'}
+        fields['club_id'] = club_map.get(club_name)
+        if fields['club_id'] is None:
+            logger.debug(f"{club_name} not found.")
+        rows.append((fields, stats_data))
+    batch = rows
+
+    with transaction.atomic():
+        Player.objects.bulk_create(
+            [Player(**player_fields) for player_fields, _ in batch],
+            update_conflicts=True,
+            unique_fields=['fotmob_id'],
+            update_fields=PLAYER_UPDATE_FIELDS,
+        )
+
+        fotmob_ids = [player_fields['fotmob_id'] for player_fields, _ in batch]
+        player_ids = dict(
+            Player.objects.filter(fotmob_id__in=fotmob_ids).values_list('fotmob_id', 'id')
+        )
 
-db_lock = threading.Lock()
+        # un poste par ligne pour le filtre exact du dashboard
+        PlayerPosition.objects.filter(player_id__in=player_ids.values()).delete()
+        PlayerPosition.objects.bulk_create([
+            PlayerPosition(player_id=player_ids[player_fields['fotmob_id']], position=position)
+            for player_fields, _ in batch
+            for position in {p.strip() for p in player_fields['position'].split(',') if p.strip()}
+        ])
+
+        data_objects = [
+            Data(player_id=player_ids[player_fields['fotmob_id']], **stats_data)
+            for player_fields, stats_data in batch
+            if stats_data is not None
+        ]
+        # Data n'a pas de contrainte unique sur player : on remplace les lignes existantes
+        Data.objects.filter(player_id__in=[data.player_id for data in data_objects]).delete()
+        Data.objects.bulk_create(data_objects)
+
+    # bulk_create n'envoie pas post_save : on invalide les graphiques à la main
+    bump_scatter_cache_version()
+
+    logger.info(f"Saved {len(batch)} players ({len(data_objects)} with stats)")
 
-def get_player_data_multithreaded(player_links, max_workers=3):
-    """Version multi-thread pour scraper les données des joueurs"""
-    logger.info(f"Starting to scrape player data with {max_workers} workers...")
+def try_save_player_batch(batch, club_map):
+    """Enregistre un lot, une erreur est journalisée sans interrompre le scraping"""
+    try:
+        save_player_batch(batch, club_map)
+        return True
+    except Exception as e:
+        logger.error(f"Error saving batch of {len(batch)} players: {e}")
+        return False
+
+def run_pipeline(urls, log_queue, max_workers=3):
+    """Enchaîne ligues, équipes et joueurs dans un même pool de workers"""
+    logger.info(f"Starting to scrape with {max_workers} workers...")
+    club_map = {}
+    pending_players = deque()
+    seen_players = set()
+    batch = []
+    team_count = 0
+    submitted_count = 0
     successful_count = 0
     failed_count = 0
-    
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_player = {
-            executor.submit(scrape_single_player, link, i+1, len(player_links)): link 
-            for i, link in enumerate(player_links)
-        }
-        
-        for future in as_completed(future_to_player):
-            player_link = future_to_player[future]
-            try:
-                success = future.result()
-                if success:
-                    successful_count += 1
-                else:
-                    failed_count += 1
-            except Exception as e:
-                logger.error(f"Error processing player {player_link}: {e}")
-                failed_count += 1
-    
-    logger.info(f"\033[92mSuccess: {successful_count}, Failed: {failed_count}\033[0m")
+    max_inflight_players = max_workers * 2
 
-def get_text_or_none(element):
     try:
-        return element.text.strip()
-    except:
-        return None
+        with create_executor(max_workers, log_queue) as executor:
+            # chaque résultat alimente aussitôt l'étape suivante
+            inflight = {executor.submit(scrape_league, url): ('league', url) for url in urls}
+            inflight_players = 0
+
+            while inflight or pending_players:
+                # les joueurs sont soumis au fil de l'eau pour borner la mémoire
+                while pending_players and inflight_players < max_inflight_players:
+                    player_link = pending_players.popleft()
+                    submitted_count += 1
+                    inflight[executor.submit(scrape_single_player, player_link, submitted_count)] = ('player', player_link)
+                    inflight_players += 1
+
+                done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, link = inflight.pop(future)
+                    if stage == 'player':
+                        inflight_players -= 1
+
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.error(f"Error processing {stage} {link}: {e}")
+                        if stage == 'player':
+                            failed_count += 1
+                        continue
+
+                    if stage == 'league':
+                        league_title, teams = result
+                        if not league_title:
+                            logger.error(f"League title not found, skipping {link}")
+                            continue
+                        try:
+                            club_map.update(save_league(league_title, [team_name for _, team_name in teams]))
+                        except Exception as e:
+                            logger.error(f"Error saving league {league_title}: {e}")
+                            continue
+                        team_count += len(teams)
+                        logger.info(f"Found {len(teams)} team links for {league_title}")
+                        for team_link, _ in teams:
+                            inflight[executor.submit(scrape_team_players, team_link)] = ('team', team_link)
+                    elif stage == 'team':
+                        for player_link in result:
+                            if player_link not in seen_players:
+                                seen_players.add(player_link)
+                                pending_players.append(player_link)
+                    elif result is not None:
+                        batch.append(result)
+                        successful_count += 1
+                    else:
+                        failed_count += 1
+
+                if len(batch) >= BATCH_SIZE:
+                    if not try_save_player_batch(batch, club_map):
+                        successful_count -= len(batch)
+                        failed_count += len(batch)
+                    batch = []
+                    logger.info(f"Progress: {successful_count + failed_count}/{len(seen_players)} players")
+    finally:
+        # seul le dernier lot, jamais tenté, reste à enregistrer, même si le pipeline s'interrompt
+        if not try_save_player_batch(batch, club_map):
+            successful_count -= len(batch)
+            failed_count += len(batch)
+
+    logger.info(f"Found {team_count} team links and {len(seen_players)} player links")
+    logger.info(f"\033[92mSuccess: {successful_count}, Failed: {failed_count}\033[0m")
+
+_STAT_RE = re.compile(r'\s*(-?\d+(?:[.,]\d+)?)\s*%?\s*')
+_MV_RE = re.compile(r'\s*€?\s*(\d+(?:[.,]\d+)?)\s*([MK]?)\s*', re.I)
 
 def parse_stat_value(value):
-    if value.endswith('%'):
-        value = value[:-1]
-    value = value.replace(',', '.')
-    try:
-        value = float(value) if '.' in value else int(value)
-        return value
-    except:
+    match = _STAT_RE.fullmatch(value) if value else None
+    if not match:
         return None
+    number = match.group(1).replace(',', '.')
+    return float(number) if '.' in number else int(number)
 
 def parse_market_value(value):
-    value = value.replace('€', '').strip().upper()
-    if value.endswith('M'):
-        return int(float(value[:-1]) * 1_000_000)
-    elif value.endswith('K'):
-        return int(float(value[:-1]) * 1_000)
-    else:
-        try:
-            return int(value)
-        except:
-            return None
\ No newline at end of file
+    match = _MV_RE.fullmatch(value) if value else None
+    if not match:
+        return None
+    number = float(match.group(1).replace(',', '.'))
+    suffix = match.group(2).upper()
+    return int(number * (1_000_000 if suffix == 'M' else 1_000 if suffix == 'K' else 1))
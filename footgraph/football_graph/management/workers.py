@@ -0,0 +1,15 @@
+import logging
+from logging.handlers import QueueHandler
+import django
+from django.utils.module_loading import import_string
+
+def setup_worker(log_queue, initializer):
+    """Prépare un process worker spawné : Django, logs, puis l'initialisation du scraping"""
+    # un process spawné repart de zéro : les modèles ne sont importables qu'après django.setup()
+    django.setup()
+
+    root = logging.getLogger()
+    root.handlers = [QueueHandler(log_queue)]
+    root.setLevel(logging.INFO)
+
+    import_string(initializer)()
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.3 on 2026-10-15 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('football_graph', '0004_alter_player_market_value'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='club',
+            name='name',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+        migrations.AddConstraint(
+            model_name='club',
+            constraint=models.UniqueConstraint(fields=('name', 'league'), name='uniq_club_league'),
+        ),
+    ]
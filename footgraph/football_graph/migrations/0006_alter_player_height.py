@@ -0,0 +1,28 @@
+# Generated by Django 5.2.3 on 2026-10-15 09:40
+
+from django.db import migrations, models
+
+
+def clean_heights(apps, schema_editor):
+    """Ne garde que les tailles numériques avant la conversion en entier"""
+    Player = apps.get_model('football_graph', 'Player')
+    for player in Player.objects.exclude(height__isnull=True).only('id', 'height'):
+        height = player.height.split()[0] if player.height.strip() else ''
+        player.height = height if height.isdigit() else None
+        player.save(update_fields=['height'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('football_graph', '0005_alter_club_name_club_uniq_club_league'),
+    ]
+
+    operations = [
+        migrations.RunPython(clean_heights, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='player',
+            name='height',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.3 on 2026-10-15 10:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def split_positions(apps, schema_editor):
+    """Crée une ligne par poste à partir de la liste 'Poste1, Poste2' des joueurs"""
+    Player = apps.get_model('football_graph', 'Player')
+    PlayerPosition = apps.get_model('football_graph', 'PlayerPosition')
+    player_positions = [
+        PlayerPosition(player_id=player_id, position=position)
+        for player_id, positions in Player.objects.exclude(position='').values_list('id', 'position')
+        for position in {p.strip() for p in positions.split(',') if p.strip()}
+    ]
+    PlayerPosition.objects.bulk_create(player_positions, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('football_graph', '0007_player_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerPosition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.CharField(db_index=True, max_length=50)),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='positions', to='football_graph.player')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('player', 'position'), name='uniq_player_position')],
+            },
+        ),
+        migrations.RunPython(split_positions, migrations.RunPython.noop),
+    ]
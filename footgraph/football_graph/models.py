@@ -8,10 +8,15 @@ class League(models.Model):
         return f"{self.name} ({self.country})"
 
 class Club(models.Model):
-    name = models.CharField(max_length=100)
+    name = models.CharField(max_length=100, db_index=True)
     league = models.ForeignKey(League, on_delete=models.CASCADE, related_name='clubs')
     founded_year = models.IntegerField(null=True, blank=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['name', 'league'], name='uniq_club_league'),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -23,12 +28,33 @@ class Player(models.Model):
     country = models.CharField(max_length=50)
     shirt_number = models.IntegerField(null=True, blank=True)
     age = models.IntegerField(null=True, blank=True)
-    height = models.CharField(max_length=10, null=True, blank=True)
+    height = models.IntegerField(null=True, blank=True)
     market_value = models.BigIntegerField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['club', 'country'], name='player_club_country_idx'),
+            models.Index(fields=['country'], name='player_country_idx'),
+            models.Index(fields=['age'], name='player_age_idx'),
+            models.Index(fields=['height'], name='player_height_idx'),
+            models.Index(fields=['market_value'], name='player_market_value_idx'),
+        ]
+
     def __str__(self):
         return f"{self.name} ({self.club.name})"
 
+class PlayerPosition(models.Model):
+    player = models.ForeignKey(Player, on_delete=models.CASCADE, related_name='positions')
+    position = models.CharField(max_length=50, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['player', 'position'], name='uniq_player_position'),
+        ]
+
+    def __str__(self):
+        return f"{self.player.name}: {self.position}"
+
 class Data(models.Model):
     player = models.ForeignKey(Player, on_delete=models.CASCADE, related_name='data')
 
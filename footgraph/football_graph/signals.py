@@ -0,0 +1,24 @@
+import time
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Player, Data
+
+# part of every scatter plot cache key, bumping it invalidates them all
+SCATTER_CACHE_VERSION_KEY = 'scatter_cache_version'
+
+def new_scatter_cache_version():
+    """A version never used before, so old chart entries can never be served again"""
+    return time.time_ns()
+
+def bump_scatter_cache_version():
+    """Invalidate every cached scatter plot"""
+    # set with no expiry: incr() would re-set the key with the default timeout
+    cache.set(SCATTER_CACHE_VERSION_KEY, new_scatter_cache_version(), None)
+
+# no post_delete on Data: a receiver would disable the fast delete of the
+# scraper's batches, which bumps the version itself once per batch
+@receiver([post_save, post_delete], sender=Player)
+@receiver(post_save, sender=Data)
+def invalidate_scatter_cache(sender, **kwargs):
+    bump_scatter_cache_version()
@@ -1,3 +1,120 @@
-from django.test import TestCase
+import tempfile
+import time
+from unittest import mock
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from .management.commands.scrape_data import parse_market_value, parse_stat_value
+from .models import League, Club, Player, Data
+from .signals import SCATTER_CACHE_VERSION_KEY, bump_scatter_cache_version
+from .views import scatter_cache_key
 
-# Create your tests here.
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class ChartQueryCountTests(TestCase):
+    """The chart is built from a fixed number of queries, whatever the number of players"""
+
+    @classmethod
+    def setUpTestData(cls):
+        league = League.objects.create(name='Ligue 1', country='France')
+        club = Club.objects.create(name='Lille', league=league)
+        for index in range(20):
+            player = Player.objects.create(
+                fotmob_id=index,
+                name=f'Player {index}',
+                club=club,
+                position='Striker, Winger',
+                country='France',
+                age=20 + index,
+                height=180,
+                market_value=(index + 1) * 1000000,
+            )
+            Data.objects.create(player=player, goals=index, expected_goals=index / 2)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_chart_api_queries(self):
+        # players.exists() and the stats rows
+        with self.assertNumQueries(2):
+            response = self.client.post(reverse('chart_api'), {'x_axis': 'expected_goals', 'y_axis': 'goals'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['player_count'], 20)
+
+    def test_home_post_queries(self):
+        # the four dropdown lists, then the same two chart queries
+        with self.assertNumQueries(6):
+            response = self.client.post(reverse('home'), {'x_axis': 'expected_goals', 'y_axis': 'goals'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['player_count'], 20)
+
+
+class ParseValueTests(SimpleTestCase):
+    """The whole scraped text must match, anything unexpected gives None"""
+
+    def test_parse_stat_value(self):
+        cases = [
+            ('12', 12),
+            ('0.45', 0.45),
+            ('1,5', 1.5),
+            ('78%', 78),
+            ('-0.3', -0.3),
+            (' 7 ', 7),
+            ('+3', None),
+            ('.5', None),
+            ('3/4', None),
+            ('abc', None),
+            ('', None),
+            (None, None),
+        ]
+        for value, expected in cases:
+            with self.subTest(value=value):
+                self.assertEqual(parse_stat_value(value), expected)
+
+    def test_parse_market_value(self):
+        cases = [
+            ('€45M', 45000000),
+            ('€1.2M', 1200000),
+            ('€1,5M', 1500000),
+            ('€850K', 850000),
+            (' €12m ', 12000000),
+            ('€500', 500),
+            ('€1.2B', None),
+            ('€45Mio', None),
+            ('€100M+', None),
+            ('-', None),
+            ('', None),
+            (None, None),
+        ]
+        for value, expected in cases:
+            with self.subTest(value=value):
+                self.assertEqual(parse_market_value(value), expected)
+
+
+class ScatterCacheVersionTests(SimpleTestCase):
+    """Runs on the file based cache configured in settings, shared by the scraper and the web server"""
+
+    def setUp(self):
+        location = tempfile.TemporaryDirectory()
+        self.addCleanup(location.cleanup)
+        file_cache = self.settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': location.name,
+        }})
+        file_cache.enable()
+        self.addCleanup(file_cache.disable)
+
+    def test_version_never_expires(self):
+        bump_scatter_cache_version()
+        version = cache.get(SCATTER_CACHE_VERSION_KEY)
+        later = time.time() + 3600
+        with mock.patch('time.time', return_value=later):
+            self.assertEqual(cache.get(SCATTER_CACHE_VERSION_KEY), version)
+
+    def test_bump_changes_every_key(self):
+        form_data = {'x_axis': 'expected_goals', 'y_axis': 'goals'}
+        keys = {scatter_cache_key(form_data)}
+        for _ in range(3):
+            bump_scatter_cache_version()
+            keys.add(scatter_cache_key(form_data))
+        self.assertEqual(len(keys), 4)
@@ -4,4 +4,5 @@ from . import views
 
 urlpatterns = [
     path("", views.home, name="home"),
+    path("api/chart/", views.chart_api, name="chart_api"),
 ]
\ No newline at end of file
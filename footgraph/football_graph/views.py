@@ -1,9 +1,13 @@
 from django.shortcuts import render
-from django.http import JsonResponse
-from django.db.models import Q
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.http import require_POST
+from django.db.models import F, Value, Case, When, CharField
+from django.db.models.functions import Substr, StrIndex, Trim
 from .models import League, Club, Player, Data
+from .signals import SCATTER_CACHE_VERSION_KEY, new_scatter_cache_version
 import numpy as np
 import json
+import hashlib
 from django.core.cache import cache
 import pandas as pd
 import logging
@@ -14,6 +18,108 @@ import plotly
 
 logger = logging.getLogger(__name__)
 
+SCATTER_CACHE_TIMEOUT = 900
+# above this many points the scatter plot is replaced by a density heatmap
+AGGREGATION_THRESHOLD = 20000
+
+# Plotly styles shared by every chart
+AXIS_STYLE = dict(
+    showgrid=True,
+    gridwidth=1,
+    gridcolor='rgba(0,0,0,0.1)',
+    title_font_size=14,
+    zeroline=True,
+    zerolinecolor='rgba(0,0,0,0.2)',
+    zerolinewidth=1
+)
+
+MARKER_STYLE = dict(
+    size=12,
+    color='steelblue',
+    line=dict(width=2, color='white'),
+    opacity=0.8
+)
+
+CHART_LAYOUT = dict(
+    title_x=0.5,
+    title_font_size=18,
+    width=900,
+    height=650,
+    plot_bgcolor='rgba(248,249,250,0.8)',
+    paper_bgcolor='white',
+    font=dict(size=12),
+    showlegend=False,
+    xaxis=AXIS_STYLE,
+    yaxis=AXIS_STYLE,
+    margin=dict(l=50, r=50, t=80, b=50)
+)
+
+# All available data fields for axis selection
+DATA_FIELD_CHOICES = (
+    # Shooting
+    ('goals', 'Goals'),
+    ('expected_goals', 'Expected Goals'),
+    ('xg_on_target', 'xG on Target'),
+    ('penalty_goals', 'Penalty Goals'),
+    ('non_penalty_xg', 'Non-Penalty xG'),
+    ('shots', 'Shots'),
+    ('shots_on_target', 'Shots on Target'),
+    
+    # Passing
+    ('assists', 'Assists'),
+    ('expected_assists', 'Expected Assists'),
+    ('successful_passes', 'Successful Passes'),
+    ('pass_accuracy', 'Pass Accuracy'),
+    ('accurate_long_balls', 'Accurate Long Balls'),
+    ('long_ball_accuracy', 'Long Ball Accuracy'),
+    ('chances_created', 'Chances Created'),
+    ('successful_crosses', 'Successful Crosses'),
+    ('cross_accuracy', 'Cross Accuracy'),
+    
+    # Possession
+    ('successful_dribbles', 'Successful Dribbles'),
+    ('dribble_success', 'Dribble Success'),
+    ('touches', 'Touches'),
+    ('touches_in_opposition_box', 'Touches in Opposition Box'),
+    ('dispossessed', 'Dispossessed'),
+    ('fouls_won', 'Fouls Won'),
+    ('penalties_awarded', 'Penalties Awarded'),
+    
+    # Defending
+    ('tackles_won', 'Tackles Won'),
+    ('tackles_won_percentage', 'Tackles Won Percentage'),
+    ('duels_won', 'Duels Won'),
+    ('duels_won_percentage', 'Duels Won Percentage'),
+    ('aerial_duels_won', 'Aerial Duels Won'),
+    ('aerial_duels_won_percentage', 'Aerial Duels Won Percentage'),
+    ('interceptions', 'Interceptions'),
+    ('blocked', 'Blocked'),
+    ('fouls_committed', 'Fouls Committed'),
+    ('recoveries', 'Recoveries'),
+    ('possession_won_final_3rd', 'Possession Won Final 3rd'),
+    ('dribbled_past', 'Dribbled Past'),
+    
+    # Discipline
+    ('yellow_cards', 'Yellow Cards'),
+    ('red_cards', 'Red Cards'),
+    
+    # Goalkeeping
+    ('saves', 'Saves'),
+    ('save_percentage', 'Save Percentage'),
+    ('goals_conceded', 'Goals Conceded'),
+    ('goals_prevented', 'Goals Prevented'),
+    ('clean_sheets', 'Clean Sheets'),
+    ('error_led_to_goal', 'Error Led to Goal'),
+    ('high_claim', 'High Claim'),
+    
+    # Goalkeeping Distribution
+    ('gk_pass_accuracy', 'GK Pass Accuracy'),
+    ('gk_accurate_long_balls', 'GK Accurate Long Balls'),
+    ('gk_long_ball_accuracy', 'GK Long Ball Accuracy'),
+)
+
+DATA_FIELDS = frozenset(field_name for field_name, _ in DATA_FIELD_CHOICES)
+
 def home(request):
     """Main view for player filtering and visualization"""
     try:
@@ -24,17 +130,23 @@ def home(request):
         positions = cache.get(f'{cache_key_prefix}_positions')
         
         if not all([leagues, clubs, countries, positions]):
-            leagues = League.objects.all().order_by('name')
-            clubs = Club.objects.all().order_by('name')
+            # materialized rows, so a cache hit never goes back to the database
+            leagues = list(League.objects.order_by('name').values('id', 'name'))
+            clubs = list(Club.objects.order_by('name').values('id', 'name'))
             countries = list(Player.objects.values_list('country', flat=True).distinct().order_by('country'))
             
-            positions_raw = Player.objects.exclude(position__isnull=True).exclude(position='').values_list('position', flat=True)
-            unique_positions = set()
-            for pos in positions_raw:
-                if pos:
-                    cleaned_pos = pos.split(',')[0].strip()
-                    unique_positions.add(cleaned_pos)
-            positions = sorted(list(unique_positions))
+            # first position of each player, de-duplicated by the database
+            first_position = Case(
+                When(position__contains=',', then=Substr('position', 1, StrIndex('position', Value(',')) - 1)),
+                default=F('position'),
+                output_field=CharField(),
+            )
+            positions = sorted(
+                position for position in Player.objects.exclude(position__isnull=True).exclude(position='')
+                .annotate(first_position=Trim(first_position))
+                .values_list('first_position', flat=True).distinct()
+                if position
+            )
             
             # set cache with a 1-hour expiration for more efficient data retrieval
             cache.set(f'{cache_key_prefix}_leagues', leagues, 3600)
@@ -63,14 +175,14 @@ def handle_post_request(request, leagues, clubs, countries, positions):
             context['error'] = 'No players found matching the selected criteria.'
             return render(request, 'football_graph/home.html', context)
         
-        chart_data = create_player_scatter_plot(players, form_data['x_axis'], form_data['y_axis'])
+        chart_data = get_scatter_plot(players, form_data)
         
         if chart_data is None:
             context = build_context(leagues, clubs, countries, positions, form_data)
             context['error'] = 'No data available for the selected statistics.'
             return render(request, 'football_graph/home.html', context)
 
-        context = build_context(leagues, clubs, countries, positions, form_data, chart_data, players)
+        context = build_context(leagues, clubs, countries, positions, form_data, chart_data)
         return render(request, 'football_graph/home.html', context)
         
     except Exception as e:
@@ -79,87 +191,132 @@ def handle_post_request(request, leagues, clubs, countries, positions):
         context['error'] = 'An error occurred while processing your request.'
         return render(request, 'football_graph/home.html', context)
 
+def scatter_cache_key(form_data):
+    """Cache key for the scatter plot matching these filters"""
+    version = cache.get_or_set(SCATTER_CACHE_VERSION_KEY, new_scatter_cache_version, None)
+    digest = hashlib.blake2b(json.dumps(form_data, sort_keys=True).encode(), digest_size=16).hexdigest()
+    return f'scatter:{version}:{digest}'
+
+def get_scatter_plot(players, form_data):
+    """Scatter plot for these filters, from the cache when available"""
+    cache_key = scatter_cache_key(form_data)
+    chart_data = cache.get(cache_key)
+    if chart_data is None:
+        chart_data = create_player_scatter_plot(players, form_data['x_axis'], form_data['y_axis'])
+        if chart_data is not None:
+            cache.set(cache_key, chart_data, SCATTER_CACHE_TIMEOUT)
+    return chart_data
+
+@require_POST
+def chart_api(request):
+    """Return the chart for the submitted filters as Plotly JSON"""
+    try:
+        form_data = extract_form_data(request)
+
+        players = apply_filters(form_data)
+
+        if not players.exists():
+            return JsonResponse({'error': 'No players found matching the selected criteria.'})
+
+        chart_data = get_scatter_plot(players, form_data)
+
+        if chart_data is None:
+            return JsonResponse({'error': 'No data available for the selected statistics.'})
+
+        # the figure is already serialized, embed it as is
+        payload = (
+            f'{{"figure": {chart_data["figure"]}, '
+            f'"aggregated": {json.dumps(chart_data["aggregated"])}, '
+            f'"player_count": {chart_data["player_count"]}}}'
+        )
+        return HttpResponse(payload, content_type='application/json')
+
+    except Exception as e:
+        logger.error(f"Error in chart API: {str(e)}")
+        return JsonResponse({'error': 'An error occurred while processing your request.'}, status=500)
+
 def handle_get_request(request, leagues, clubs, countries, positions):
     """Handle GET request for initial page load"""
     context = build_context(leagues, clubs, countries, positions)
     return render(request, 'football_graph/home.html', context)
 
+# (field, default, lower bound, upper bound) of the numeric filters,
+# market values are entered in millions
+FORM_INT_SPECS = (
+    ('min_age', 0, 0, 100),
+    ('max_age', 100, 0, 100),
+    ('min_height', 0, 0, 250),
+    ('max_height', 250, 0, 250),
+    ('min_market_value', 0, 0, 500),
+    ('max_market_value', 500, 0, 500),
+)
+
+def _clamp_int(post, name, default, lo, hi):
+    """Read an integer field clamped to [lo, hi], default if it is invalid"""
+    try:
+        value = int(post.get(name, default) or default)
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid form value for {name}: {post.get(name)!r}")
+        return default
+    return max(lo, min(hi, value))
+
 def extract_form_data(request):
     """Extract and validate form data from POST request"""
-    try:
-        return {
-            'league_ids': [int(x) for x in request.POST.getlist('league') if x.isdigit()],
-            'club_ids': [int(x) for x in request.POST.getlist('club') if x.isdigit()],
-            'countries_selected': request.POST.getlist('country'),
-            'positions_selected': request.POST.getlist('position'),
-            'min_age': max(0, int(request.POST.get('min_age', 0) or 0)),
-            'max_age': min(100, int(request.POST.get('max_age', 100) or 100)),
-            'min_height': max(0, int(request.POST.get('min_height', 0) or 0)),
-            'max_height': min(250, int(request.POST.get('max_height', 250) or 250)),
-            'min_market_value': max(0, int(request.POST.get('min_market_value', 0) or 0)) * 1000000,
-            'max_market_value': min(500000000, int(request.POST.get('max_market_value', 500) or 500)) * 1000000,
-            'x_axis': request.POST.get('x_axis', 'expected_goals'),
-            'y_axis': request.POST.get('y_axis', 'goals'),
-            'min_market_value_display': int(request.POST.get('min_market_value', 0) or 0),
-            'max_market_value_display': int(request.POST.get('max_market_value', 500) or 500),
-        }
-    except (ValueError, TypeError) as e:
-        logger.warning(f"Invalid form data: {str(e)}")
-        return {
-            'league_ids': [], 'club_ids': [], 'countries_selected': [], 'positions_selected': [],
-            'min_age': 0, 'max_age': 100, 'min_height': 0, 'max_height': 250,
-            'min_market_value': 0, 'max_market_value': 500000000,
-            'x_axis': 'expected_goals', 'y_axis': 'goals',
-            'min_market_value_display': 0, 'max_market_value_display': 500,
-        }
+    post = request.POST
+    form_data = {
+        'league_ids': [int(x) for x in post.getlist('league') if x.isdigit()],
+        'club_ids': [int(x) for x in post.getlist('club') if x.isdigit()],
+        'countries_selected': post.getlist('country'),
+        'positions_selected': post.getlist('position'),
+        'x_axis': post.get('x_axis', 'expected_goals'),
+        'y_axis': post.get('y_axis', 'goals'),
+    }
+    for name, default, lo, hi in FORM_INT_SPECS:
+        form_data[name] = _clamp_int(post, name, default, lo, hi)
+
+    form_data['min_market_value_display'] = form_data['min_market_value']
+    form_data['max_market_value_display'] = form_data['max_market_value']
+    form_data['min_market_value'] *= 1000000
+    form_data['max_market_value'] *= 1000000
+    return form_data
 
 def apply_filters(form_data):
     """Apply filters to player queryset"""
-    players = Player.objects.select_related('club', 'club__league').prefetch_related('data')
-    print(f"Initial player count: {players.count()}")
+    # only used for exists() and as a player__in subquery, no columns are loaded
+    players = Player.objects.all()
     if form_data['league_ids']:
         players = players.filter(club__league_id__in=form_data['league_ids'])
-        print(f"Player count after league filter: {players.count()}")
     
     if form_data['club_ids']:
         players = players.filter(club_id__in=form_data['club_ids'])
-        print(f"Player count after club filter: {players.count()}")
     
     if form_data['countries_selected']:
         players = players.filter(country__in=form_data['countries_selected'])
-        print(f"Player count after country filter: {players.count()}")
     
     if form_data['positions_selected']:
-        position_q = Q()
-        for position in form_data['positions_selected']:
-            position_q |= Q(position__icontains=position)
-        players = players.filter(position_q)
-        print(f"Player count after position filter: {players.count()}")
+        players = players.filter(positions__position__in=form_data['positions_selected']).distinct()
     
     # Age
     if form_data['min_age'] > 0:
         players = players.filter(age__gte=form_data['min_age'])
     if form_data['max_age'] < 100:
         players = players.filter(age__lte=form_data['max_age'])
-    print(f"Player count after age filter: {players.count()}")
     
     # Height
     if form_data['min_height'] > 0:
         players = players.filter(height__gte=form_data['min_height'])
     if form_data['max_height'] < 250:
         players = players.filter(height__lte=form_data['max_height'])
-    print(f"Player count after height filter: {players.count()}")
     
     # Market value
     if form_data['min_market_value'] > 0:
         players = players.filter(market_value__gte=form_data['min_market_value'])
     if form_data['max_market_value'] < 500000000:
         players = players.filter(market_value__lte=form_data['max_market_value'])
-    print(f"Player count after market value filter: {players.count()}")
     
     return players.order_by('name')
 
-def build_context(leagues, clubs, countries, positions, form_data=None, chart_data=None, players=None):
+def build_context(leagues, clubs, countries, positions, form_data=None, chart_data=None):
     """Build context dictionary for template rendering"""
     context = {
         'leagues': leagues,
@@ -190,190 +347,114 @@ def build_context(leagues, clubs, countries, positions, form_data=None, chart_da
     if chart_data:
         context.update({
             'chart_data': {
-                'graphic': chart_data['graphic'],
+                'figure': chart_data['figure'],
+                'aggregated': chart_data['aggregated'],
             },
             'x_axis_label': form_data['x_axis'].replace('_', ' ').title(),
             'y_axis_label': form_data['y_axis'].replace('_', ' ').title(),
+            # players plotted, already counted while building the chart
+            'player_count': chart_data['player_count'],
         })
     
-    if players is not None:
-        context['players'] = players
-        context['player_count'] = players.count()
-    
     return context
 
-def create_player_scatter_plot(players, x_axis, y_axis):
-    """Create interactive scatter plot with Plotly"""
-    if not players.exists():
-        logger.warning("No players found for the scatter plot.")
+def build_player_figure(players, x_axis, y_axis):
+    """Build the Plotly figure for the selected players, None if there is nothing to plot"""
+    if x_axis not in DATA_FIELDS or y_axis not in DATA_FIELDS:
+        logger.warning(f"Invalid axis selection: {x_axis}, {y_axis}")
         return None
 
-    plot_data = []
-    for player in players:
-        data_obj = player.data.first()
-        if not data_obj:
-            logger.warning(f"No data found for player: {player.name}")
-            continue
-
-        x_value = getattr(data_obj, x_axis, None)
-        y_value = getattr(data_obj, y_axis, None)
-
-        if x_value is None or y_value is None:
-            logger.warning(f"Missing x or y value for player: {player.name}")
-            continue
-
-        if x_value >= 0 and y_value >= 0:
-            plot_data.append({
-                'name': player.name,
-                'club': player.club.name if player.club else 'Unknown',
-                'country': player.country or 'Unknown',
-                'position': player.position or 'Unknown',
-                'age': player.age or 'Unknown',
-                'market_value': f"€{float(player.market_value)/1000000:.1f}M" if player.market_value and str(player.market_value).isdigit() else 'Unknown',
-                'x': float(x_value),
-                'y': float(y_value)
-            })
-
-    if not plot_data:
+    # one query for the stats and the player details instead of one per player,
+    # rows with a missing or negative axis value are dropped by the database
+    rows = Data.objects.filter(
+        player__in=players,
+        **{f'{x_axis}__gte': 0, f'{y_axis}__gte': 0},
+    ).order_by('player__name', 'id').values(
+        'player_id', x_axis, y_axis,
+        'player__name', 'player__club__name', 'player__country',
+        'player__position', 'player__age', 'player__market_value',
+    )
+
+    df = pd.DataFrame.from_records(list(rows))
+    if df.empty:
         logger.warning("No valid data points for the scatter plot.")
         return None
 
-    df = pd.DataFrame(plot_data)
-    print(f"DataFrame shape: {df.shape}")
-    print(f"DataFrame columns: {df.columns.tolist()}")
-    print("Sample data:")
-    print(df.head())
-
-    # Create the scatter plot
-    fig = px.scatter(
-        df,
-        x='x',
-        y='y',
-        title=f'{x_axis.replace("_", " ").title()} vs {y_axis.replace("_", " ").title()}',
-        labels={
-            'x': x_axis.replace('_', ' ').title(), 
-            'y': y_axis.replace('_', ' ').title()
-        }
-    )
+    # keep only the first data row of each player
+    df = df.drop_duplicates(subset='player_id')
+    df['x'] = df[x_axis].astype('float64')
+    df['y'] = df[y_axis].astype('float64')
 
-    fig.update_traces(
-        marker=dict(
-            size=12, 
-            color='steelblue', 
-            line=dict(width=2, color='white'),
-            opacity=0.8
-        ),
-        hovertemplate='<b>%{text}</b><br>' +
-                     f'{x_axis.replace("_", " ").title()}: %{{x}}<br>' +
-                     f'{y_axis.replace("_", " ").title()}: %{{y}}<br>' +
-                     'Club: %{customdata[0]}<br>' +
-                     'Country: %{customdata[1]}<br>' +
-                     'Position: %{customdata[2]}<br>' +
-                     'Age: %{customdata[3]}<br>' +
-                     'Market Value: %{customdata[4]}' +
-                     '<extra></extra>',
-        text=df['name'],
-        customdata=df[['club', 'country', 'position', 'age', 'market_value']].values
-    )
+    df['name'] = df['player__name']
+    df['club'] = df['player__club__name'].replace('', 'Unknown').fillna('Unknown')
+    df['country'] = df['player__country'].replace('', 'Unknown').fillna('Unknown')
+    df['position'] = df['player__position'].replace('', 'Unknown').fillna('Unknown')
 
-    fig.update_layout(
-        title_x=0.5,
-        title_font_size=18,
-        width=900,
-        height=650,
-        plot_bgcolor='rgba(248,249,250,0.8)',
-        paper_bgcolor='white',
-        font=dict(size=12),
-        showlegend=False,
-        xaxis=dict(
-            showgrid=True,
-            gridwidth=1,
-            gridcolor='rgba(0,0,0,0.1)',
-            title_font_size=14,
-            zeroline=True,
-            zerolinecolor='rgba(0,0,0,0.2)',
-            zerolinewidth=1
-        ),
-        yaxis=dict(
-            showgrid=True,
-            gridwidth=1,
-            gridcolor='rgba(0,0,0,0.1)',
-            title_font_size=14,
-            zeroline=True,
-            zerolinecolor='rgba(0,0,0,0.2)',
-            zerolinewidth=1
-        ),
-        margin=dict(l=50, r=50, t=80, b=50)
-    )
+    age = df['player__age'].astype('Int64')
+    df['age'] = age.astype(object).where(age.fillna(0) != 0, 'Unknown')
+
+    # format only the known market values, the rest stays 'Unknown'
+    market_value = df['player__market_value'].to_numpy(dtype='float64', na_value=np.nan)
+    known = np.isfinite(market_value) & (market_value > 0)
+    formatted = np.full(market_value.shape, 'Unknown', dtype=object)
+    formatted[known] = np.char.add('€', np.char.add((market_value[known] / 1000000).round(1).astype(str), 'M'))
+    df['market_value'] = formatted
+
+    title = f'{x_axis.replace("_", " ").title()} vs {y_axis.replace("_", " ").title()}'
+    labels = {
+        'x': x_axis.replace('_', ' ').title(),
+        'y': y_axis.replace('_', ' ').title()
+    }
+
+    # Too many points for the browser, aggregate them into a density heatmap
+    aggregated = len(df) > AGGREGATION_THRESHOLD
+    if aggregated:
+        fig = px.density_heatmap(df, x='x', y='y', nbinsx=120, nbinsy=120, title=title, labels=labels)
+    else:
+        fig = px.scatter(
+            df,
+            x='x',
+            y='y',
+            render_mode='webgl',
+            title=title,
+            labels=labels
+        )
+
+        fig.update_traces(
+            marker=MARKER_STYLE,
+            hovertemplate='<b>%{text}</b><br>' +
+                         f'{x_axis.replace("_", " ").title()}: %{{x}}<br>' +
+                         f'{y_axis.replace("_", " ").title()}: %{{y}}<br>' +
+                         'Club: %{customdata[0]}<br>' +
+                         'Country: %{customdata[1]}<br>' +
+                         'Position: %{customdata[2]}<br>' +
+                         'Age: %{customdata[3]}<br>' +
+                         'Market Value: %{customdata[4]}' +
+                         '<extra></extra>',
+            text=df['name'],
+            customdata=df[['club', 'country', 'position', 'age', 'market_value']].to_numpy(dtype=object, copy=False)
+        )
+
+    fig.update_layout(CHART_LAYOUT)
 
-    # Convert to HTML div for embedding
-    graph_html = fig.to_html(include_plotlyjs=True, div_id="scatter-plot")
+    return fig, aggregated, len(df)
+
+def create_player_scatter_plot(players, x_axis, y_axis):
+    """Create interactive scatter plot with Plotly"""
+    figure = build_player_figure(players, x_axis, y_axis)
+    if figure is None:
+        return None
+    fig, aggregated, player_count = figure
+
+    # orjson encodes the float columns in C, escaping "</" keeps the JSON safe inside a <script>
+    graph_json = fig.to_json(engine='orjson').replace('</', '<\\/')
 
     return {
-        'graphic': graph_html
+        'figure': graph_json,
+        'aggregated': aggregated,
+        'player_count': player_count,
     }
 
 def get_data_field_choices():
     """Return all available data fields for axis selection"""
-    return [
-        # Shooting
-        ('goals', 'Goals'),
-        ('expected_goals', 'Expected Goals'),
-        ('xg_on_target', 'xG on Target'),
-        ('penalty_goals', 'Penalty Goals'),
-        ('non_penalty_xg', 'Non-Penalty xG'),
-        ('shots', 'Shots'),
-        ('shots_on_target', 'Shots on Target'),
-        
-        # Passing
-        ('assists', 'Assists'),
-        ('expected_assists', 'Expected Assists'),
-        ('successful_passes', 'Successful Passes'),
-        ('pass_accuracy', 'Pass Accuracy'),
-        ('accurate_long_balls', 'Accurate Long Balls'),
-        ('long_ball_accuracy', 'Long Ball Accuracy'),
-        ('chances_created', 'Chances Created'),
-        ('successful_crosses', 'Successful Crosses'),
-        ('cross_accuracy', 'Cross Accuracy'),
-        
-        # Possession
-        ('successful_dribbles', 'Successful Dribbles'),
-        ('dribble_success', 'Dribble Success'),
-        ('touches', 'Touches'),
-        ('touches_in_opposition_box', 'Touches in Opposition Box'),
-        ('dispossessed', 'Dispossessed'),
-        ('fouls_won', 'Fouls Won'),
-        ('penalties_awarded', 'Penalties Awarded'),
-        
-        # Defending
-        ('tackles_won', 'Tackles Won'),
-        ('tackles_won_percentage', 'Tackles Won Percentage'),
-        ('duels_won', 'Duels Won'),
-        ('duels_won_percentage', 'Duels Won Percentage'),
-        ('aerial_duels_won', 'Aerial Duels Won'),
-        ('aerial_duels_won_percentage', 'Aerial Duels Won Percentage'),
-        ('interceptions', 'Interceptions'),
-        ('blocked', 'Blocked'),
-        ('fouls_committed', 'Fouls Committed'),
-        ('recoveries', 'Recoveries'),
-        ('possession_won_final_3rd', 'Possession Won Final 3rd'),
-        ('dribbled_past', 'Dribbled Past'),
-        
-        # Discipline
-        ('yellow_cards', 'Yellow Cards'),
-        ('red_cards', 'Red Cards'),
-        
-        # Goalkeeping
-        ('saves', 'Saves'),
-        ('save_percentage', 'Save Percentage'),
-        ('goals_conceded', 'Goals Conceded'),
-        ('goals_prevented', 'Goals Prevented'),
-        ('clean_sheets', 'Clean Sheets'),
-        ('error_led_to_goal', 'Error Led to Goal'),
-        ('high_claim', 'High Claim'),
-        
-        # Goalkeeping Distribution
-        ('gk_pass_accuracy', 'GK Pass Accuracy'),
-        ('gk_accurate_long_balls', 'GK Accurate Long Balls'),
-        ('gk_long_ball_accuracy', 'GK Long Ball Accuracy'),
-    ]
\ No newline at end of file
+    return DATA_FIELD_CHOICES